@@ -3,10 +3,12 @@ import time
 from dataclasses import dataclass
 from datetime import datetime
 from threading import Thread
+from typing import Optional
 
 import numpy as np
 from pandas import Timestamp
 
+from .state_manager import StateManager
 from .vector import Vector
 
 ###############################################################################
@@ -146,11 +148,15 @@ class PositionReport:
 
 class AISDataState(Thread):
 
-    def __init__(self):
+    def __init__(self, state_manager: Optional[StateManager] = None):
         super().__init__(daemon=True)
         self.static_data = dict()
         self.position_data = dict()
 
+        # AIS derived states like "ship_visible" are pushed to the state manager
+        self.state_manager = state_manager or StateManager.get_instance()
+        self.state_manager.initiate_state("ship_visible")
+
         self.keep_running = True
 
     def report_static_data(self, timestamp, ship_static_data):
@@ -188,6 +194,7 @@ class AISDataState(Thread):
 
     def process_ship_data(self):
         now = Timestamp.now("UTC").value / 1e9
+        ship_visible = False
 
         for user_id, position_data in self.position_data.items():
             if position_data.moving:
@@ -208,3 +215,8 @@ class AISDataState(Thread):
                 # Use the current position to see if the ship is within your area of interest
                 logging.log(logging.INFO, ship_info)
                 logging.log(logging.INFO, current_position)
+
+                # Replace this with a check against your area of interest
+                ship_visible = True
+
+        self.state_manager.set_state("ship_visible", ship_visible)
@@ -0,0 +1,513 @@
+import math
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from threading import Lock
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+###############################################################################
+# Constants
+###############################################################################
+
+MONTHS = [
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+]
+DAYS_OF_WEEK = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+SEASONS = ["spring", "summer", "fall", "winter"]
+# apparent solar longitude of each solstice and equinox
+EARTH_POSITIONS = {
+    0: "vernal_equinox",
+    90: "summer_solstice",
+    180: "autumnal_equinox",
+    270: "winter_solstice",
+}
+
+OPERATORS = {
+    "and": "&",
+    "or": "|",
+    "xor": "^",
+    "not": "!",
+}
+
+TOKEN_REGEX = re.compile(r"\s*(?:(\w+)|(\S))")
+NAME_REGEX = re.compile(r"^\w+$")
+MONTH_DAY_REGEX = re.compile(r"^(" + "|".join(MONTHS) + r")(\d+)$")
+HOUR_REGEX = re.compile(r"^hour(\d+)$")
+HOUR_RANGE_REGEX = re.compile(r"^hour(\d+)_(\d+)$")
+
+###############################################################################
+# Astronomical Time Tables
+###############################################################################
+
+
+def _sin(x):
+    return math.sin(math.radians(x))
+
+
+def _cos(x):
+    return math.cos(math.radians(x))
+
+
+def _tan(x):
+    return math.tan(math.radians(x))
+
+
+def solar_position(timestamp, tz_hours, lat, lon) -> tuple[float, float, float]:
+    """Apparent solar longitude and the sunrise and sunset day fractions.
+
+    Same NOAA approximation used by the Java StateManager.
+    """
+    julian_date = timestamp / 86400 + 2440587.5
+    julian_century = (julian_date - 2451545) / 36525
+    geom_mean_long_sun = (
+        280.46646 + julian_century * (36000.76983 + julian_century * 0.0003032)
+    ) % 360
+    geom_mean_anom_sun = 357.52911 + julian_century * (
+        35999.05029 - 0.0001537 * julian_century
+    )
+    eccent_earth_orbit = 0.016708634 - julian_century * (
+        0.000042037 + 0.0000001267 * julian_century
+    )
+    sun_eq_of_center = (
+        _sin(geom_mean_anom_sun)
+        * (1.914602 - julian_century * (0.004817 + 0.000014 * julian_century))
+        + _sin(2 * geom_mean_anom_sun) * (0.019993 - 0.000101 * julian_century)
+        + _sin(3 * geom_mean_anom_sun) * 0.000289
+    )
+    sun_true_long = geom_mean_long_sun + sun_eq_of_center
+    sun_app_long = (
+        sun_true_long - 0.00569 - 0.00478 * _sin(125.04 - 1934.136 * julian_century)
+    )
+    mean_obliq_ecliptic = (
+        23
+        + (
+            26
+            + (
+                21.448
+                - julian_century
+                * (46.815 + julian_century * (0.00059 - julian_century * 0.001813))
+            )
+            / 60
+        )
+        / 60
+    )
+    obliq_corr = mean_obliq_ecliptic + 0.00256 * _cos(
+        125.04 - 1934.136 * julian_century
+    )
+    sun_declination = math.degrees(math.asin(_sin(obliq_corr) * _sin(sun_app_long)))
+    var_y = _tan(obliq_corr / 2) * _tan(obliq_corr / 2)
+    eq_of_time = 4 * math.degrees(
+        var_y * _sin(2 * geom_mean_long_sun)
+        - 2 * eccent_earth_orbit * _sin(geom_mean_anom_sun)
+        + 4
+        * eccent_earth_orbit
+        * var_y
+        * _sin(geom_mean_anom_sun)
+        * _cos(2 * geom_mean_long_sun)
+        - 0.5 * var_y * var_y * _sin(4 * geom_mean_long_sun)
+        - 1.25 * eccent_earth_orbit * eccent_earth_orbit * _sin(2 * geom_mean_anom_sun)
+    )
+    # clamp for polar day and night
+    ha_sunrise = math.degrees(
+        math.acos(
+            min(
+                1.0,
+                max(
+                    -1.0,
+                    _cos(90.833) / (_cos(lat) * _cos(sun_declination))
+                    - _tan(lat) * _tan(sun_declination),
+                ),
+            )
+        )
+    )
+    solar_noon = (720 - 4 * lon - eq_of_time + tz_hours * 60) / 1440
+    sunrise = solar_noon - ha_sunrise * 4 / 1440
+    sunset = solar_noon + ha_sunrise * 4 / 1440
+
+    return sun_app_long % 360, sunrise, sunset
+
+
+@dataclass(frozen=True)
+class DayInfo:
+    sunrise: float
+    sunset: float
+    season: str
+    earth_position: Optional[str]
+
+
+def compute_day_table(year, tz: ZoneInfo, lat, lon) -> list[DayInfo]:
+    """Sunrise, sunset, season, and solstice or equinox for every day of a year.
+
+    Solar values are computed at local noon. A solstice or equinox state is
+    true for the whole local day that contains it, and that day is already in
+    the season that starts with it.
+    """
+
+    def local_timestamp(d, hour):
+        return datetime(d.year, d.month, d.day, hour, tzinfo=tz).timestamp()
+
+    def tz_hours(d):
+        return datetime(d.year, d.month, d.day, 12, tzinfo=tz).utcoffset() / timedelta(
+            hours=1
+        )
+
+    first_day = date(year, 1, 1)
+    day_count = (date(year + 1, 1, 1) - first_day).days
+    days = [first_day + timedelta(days=i) for i in range(day_count + 1)]
+
+    # solar longitude at each local midnight, to find the day of each crossing
+    midnight_longs = [
+        solar_position(local_timestamp(d, 0), tz_hours(d), lat, lon)[0] for d in days
+    ]
+
+    table = []
+    for i, d in enumerate(days[:-1]):
+        sun_app_long, sunrise, sunset = solar_position(
+            local_timestamp(d, 12), tz_hours(d), lat, lon
+        )
+
+        start_long, end_long = midnight_longs[i], midnight_longs[i + 1]
+        earth_position = None
+        season = SEASONS[int(sun_app_long // 90) % 4]
+        for target, name in EARTH_POSITIONS.items():
+            if (end_long - target) % 360 < (end_long - start_long) % 360:
+                # the season that starts with the solstice or equinox
+                earth_position = name
+                season = SEASONS[target // 90]
+                break
+
+        table.append(
+            DayInfo(
+                sunrise=sunrise,
+                sunset=sunset,
+                season=season,
+                earth_position=earth_position,
+            )
+        )
+
+    return table
+
+
+###############################################################################
+# Builtin Time States
+###############################################################################
+
+
+@dataclass(frozen=True)
+class TimeFields:
+    hour: int
+    month: str
+    day_of_month: int
+    day_of_week: str
+    nighttime: bool
+    season: str
+    earth_position: Optional[str]
+
+
+def _builtin_state(name) -> Optional[Callable[[TimeFields], bool]]:
+    # resolve a state name once, instead of on every lookup
+    if name == "true":
+        return lambda fields: True
+    if name == "false":
+        return lambda fields: False
+    if name == "daytime":
+        return lambda fields: not fields.nighttime
+    if name == "nighttime":
+        return lambda fields: fields.nighttime
+    if name in MONTHS:
+        return lambda fields: fields.month == name
+    if name in DAYS_OF_WEEK:
+        return lambda fields: fields.day_of_week == name
+    if name in SEASONS:
+        return lambda fields: fields.season == name
+    if name in EARTH_POSITIONS.values():
+        return lambda fields: fields.earth_position == name
+
+    if m := MONTH_DAY_REGEX.match(name):
+        month, day_of_month = m.group(1), int(m.group(2))
+        return lambda fields: (
+            fields.month == month and fields.day_of_month == day_of_month
+        )
+
+    if m := HOUR_REGEX.match(name):
+        hour = int(m.group(1))
+        return lambda fields: fields.hour == hour
+
+    if m := HOUR_RANGE_REGEX.match(name):
+        start_hour, end_hour = int(m.group(1)), int(m.group(2))
+        if start_hour < end_hour:
+            return lambda fields: start_hour <= fields.hour <= end_hour
+        else:
+            return lambda fields: start_hour <= fields.hour or fields.hour <= end_hour
+
+    return None
+
+
+###############################################################################
+# State Expressions
+###############################################################################
+
+
+@dataclass(frozen=True)
+class CompiledStateExpr:
+    expr: str
+    evaluate: Callable[[], bool]
+    dependencies: frozenset[str]
+
+
+def _tokenize(state_expr) -> list[str]:
+    tokens = []
+    for word, symbol in TOKEN_REGEX.findall(state_expr):
+        if word:
+            tokens.append(OPERATORS.get(word.lower(), word.lower()))
+        else:
+            tokens.append(symbol)
+    return tokens
+
+
+def _compile(state_expr, values: dict[str, bool]) -> CompiledStateExpr:
+    """Parse an expression into nested closures that read from `values`.
+
+    AND, OR, and XOR have equal precedence and are left associative, same as
+    the Java StateManager.
+    """
+    tokens = _tokenize(state_expr)
+    dependencies = set()
+    index = 0
+
+    def peek():
+        return tokens[index] if index < len(tokens) else None
+
+    def parse_expression():
+        nonlocal index
+        out = parse_term()
+        while (op := peek()) in ("&", "|", "^"):
+            index += 1
+            left, right = out, parse_term()
+            if op == "&":
+                out = lambda left=left, right=right: left() and right()
+            elif op == "|":
+                out = lambda left=left, right=right: left() or right()
+            else:
+                out = lambda left=left, right=right: left() != right()
+        return out
+
+    def parse_term():
+        nonlocal index
+        token = peek()
+        index += 1
+
+        if token == "!":
+            term = parse_term()
+            return lambda: not term()
+        if token == "(":
+            out = parse_expression()
+            if peek() != ")":
+                raise ValueError(f"Missing ) in state expression {state_expr}")
+            index += 1
+            return out
+        if token is None:
+            raise ValueError(f"Unexpected end of state expression {state_expr}")
+        if NAME_REGEX.match(token):
+            dependencies.add(token)
+            return lambda: values.get(token, False)
+
+        raise ValueError(
+            f"Unexpected token {token} found in state expression {state_expr}"
+        )
+
+    evaluate = parse_expression()
+    if index < len(tokens):
+        raise ValueError(
+            f"Extra characters {' '.join(tokens[index:])} in state expression {state_expr}"
+        )
+
+    return CompiledStateExpr(state_expr, evaluate, frozenset(dependencies))
+
+
+###############################################################################
+# State Manager
+###############################################################################
+
+
+class StateManager:
+    """Python counterpart of the Java StateManager.
+
+    Expressions are compiled once and their results are cached until one of
+    the states they depend on changes. Builtin time states are refreshed at
+    most once a second from precomputed per-day tables.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.states = dict()
+
+        # current value of every state name used in a compiled expression
+        self._values = dict()
+        self._builtins = dict()
+        self._compiled = dict()
+        self._results = dict()
+        self._dependents = dict()
+        self._lock = Lock()
+
+        self._tz = ZoneInfo("US/Eastern")
+        self._location_lat = 40.7528788
+        self._location_lon = -73.9765096
+        self._day_tables = dict()
+        self._time_fields = None
+        self._next_update = 0
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = StateManager()
+
+        return cls._instance
+
+    def get_known_states(self):
+        return self.states.keys()
+
+    # ***** CONSTRUCTION / SETUP ***********************************************
+
+    def initiate_state(self, state):
+        state = state.lower()
+        if state not in self.states:
+            self.set_state(state, False)
+
+    def set_location_info(self, timezone, lat, lon):
+        with self._lock:
+            self._tz = ZoneInfo(timezone)
+            self._location_lat = lat
+            self._location_lon = lon
+            self._day_tables.clear()
+            self._next_update = 0
+
+    def compile_state_expr(self, state_expr) -> CompiledStateExpr:
+        compiled = self._compiled.get(state_expr)
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            compiled = _compile(state_expr, self._values)
+            for state in compiled.dependencies:
+                self._dependents.setdefault(state, set()).add(state_expr)
+                if state not in self._values:
+                    self._register_state(state)
+            self._compiled[state_expr] = compiled
+
+        return compiled
+
+    def _register_state(self, state):
+        if state in self.states:
+            self._values[state] = self.states[state]
+            return
+
+        builtin = _builtin_state(state)
+        if builtin is None:
+            # unknown states are false until they are set
+            self._values[state] = False
+        else:
+            self._builtins[state] = builtin
+            self._values[state] = (
+                builtin(self._time_fields) if self._time_fields else False
+            )
+
+    # ***** DEPLOYMENT *********************************************************
+
+    def get_state(self, state) -> bool:
+        return self.evaluate_state_expr(state)
+
+    def evaluate_state_expr(self, state_expr) -> bool:
+        if time.time() >= self._next_update:
+            self._update_time_and_fields()
+
+        result = self._results.get(state_expr)
+        if result is not None:
+            return result
+
+        compiled = self.compile_state_expr(state_expr)
+        with self._lock:
+            result = compiled.evaluate()
+            self._results[state_expr] = result
+
+        return result
+
+    # ***** RUNNING ************************************************************
+
+    def set_state(self, state, value):
+        state = state.lower()
+        value = bool(value)
+
+        with self._lock:
+            self.states[state] = value
+            self._builtins.pop(state, None)
+            self._update_value(state, value)
+
+    def _update_value(self, state, value):
+        if state not in self._dependents or self._values.get(state) == value:
+            return
+
+        self._values[state] = value
+        for state_expr in self._dependents[state]:
+            self._results.pop(state_expr, None)
+
+    def _day_info(self, d: date) -> DayInfo:
+        table = self._day_tables.get(d.year)
+        if table is None:
+            table = compute_day_table(
+                d.year, self._tz, self._location_lat, self._location_lon
+            )
+            self._day_tables[d.year] = table
+
+        return table[d.timetuple().tm_yday - 1]
+
+    def _update_time_and_fields(self):
+        with self._lock:
+            now = time.time()
+            local_time = datetime.fromtimestamp(now, self._tz)
+            day_info = self._day_info(local_time.date())
+            day_fraction_now = (
+                local_time.hour * 3600 + local_time.minute * 60 + local_time.second
+            ) / 86400
+
+            time_fields = TimeFields(
+                hour=local_time.hour,
+                month=MONTHS[local_time.month - 1],
+                day_of_month=local_time.day,
+                day_of_week=DAYS_OF_WEEK[local_time.weekday()],
+                nighttime=(
+                    day_fraction_now < day_info.sunrise
+                    or day_fraction_now > day_info.sunset
+                ),
+                season=day_info.season,
+                earth_position=day_info.earth_position,
+            )
+
+            if time_fields != self._time_fields:
+                self._time_fields = time_fields
+                for state, builtin in self._builtins.items():
+                    self._update_value(state, builtin(time_fields))
+
+            self._next_update = now + 1
@@ -0,0 +1,138 @@
+"""
+Check the quality of the indexed and grayscale image encoders without a GPU.
+
+The source images are encoded again with the current writers and decoded with
+the NumPy versions of the players' shaders. The script exits with an error if
+any frame is below the quality thresholds or is worse than the image data
+already committed for the Processing sketches.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from readers.grayscale import decode_grayscale_image_dir
+from readers.indexed import decode_indexed_image_dir
+from readers.quality import delta_e, load_source_images, psnr
+from writers.grayscale import prepare_grayscale_image_dir
+from writers.indexed import prepare_indexed_image_dir
+
+SOURCE_DIR = Path("src-images")
+COLOR_TEST_SOURCE_DIR = SOURCE_DIR / "color"
+GRAYSCALE_TEST_SOURCE_DIR = SOURCE_DIR / "grayscale"
+
+INDEXED_TEST_PROCESSED_DIR = Path(
+    "processing-sketches/test_indexed_player/data/indexed-image-data"
+)
+GRAYSCALE_TEST_PROCESSED_DIR = Path(
+    "processing-sketches/test_grayscale_player/data/grayscale-image-data"
+)
+
+# grayscale encoding is lossless, so any finite PSNR is a failure
+MIN_GRAYSCALE_PSNR = np.inf
+MAX_INDEXED_DELTA_E = 2.3
+# the indexed shader's texel interpolation softens edges, which costs PSNR
+MIN_INDEXED_PSNR = 28.0
+
+# allowed regression per frame relative to the committed image data
+PSNR_TOLERANCE = 0.5
+DELTA_E_TOLERANCE = 0.25
+
+
+def report(name, values, unit):
+    print(
+        f"{name}: min {values.min():.2f}{unit}, "
+        f"mean {values.mean():.2f}{unit}, max {values.max():.2f}{unit}"
+    )
+
+
+def report_stale(name, processed_dir, baseline, source):
+    print(
+        f"{name}: skipping regression checks, the data in {processed_dir} "
+        f"decodes to {baseline.shape} but the source images are {source.shape}. "
+        "Run create-test-images.py to update it."
+    )
+
+
+def check_grayscale(output_dir: Path) -> list[str]:
+    prepare_grayscale_image_dir(GRAYSCALE_TEST_SOURCE_DIR, output_dir)
+
+    source = load_source_images(GRAYSCALE_TEST_SOURCE_DIR, "L")
+    candidate = decode_grayscale_image_dir(output_dir)
+    baseline = decode_grayscale_image_dir(GRAYSCALE_TEST_PROCESSED_DIR)
+
+    if candidate.shape != source.shape:
+        return [f"grayscale: decoded {candidate.shape}, expected {source.shape}"]
+
+    candidate_psnr = psnr(candidate, source)
+    report("grayscale PSNR", candidate_psnr, "dB")
+
+    failures = []
+    for i in np.flatnonzero(candidate_psnr < MIN_GRAYSCALE_PSNR):
+        failures.append(f"grayscale frame {i}: PSNR {candidate_psnr[i]:.2f}dB")
+
+    if baseline.shape != source.shape:
+        report_stale("grayscale", GRAYSCALE_TEST_PROCESSED_DIR, baseline, source)
+        return failures
+
+    baseline_psnr = psnr(baseline, source)
+    for i in np.flatnonzero(candidate_psnr < baseline_psnr - PSNR_TOLERANCE):
+        failures.append(
+            f"grayscale frame {i}: PSNR regressed from "
+            f"{baseline_psnr[i]:.2f}dB to {candidate_psnr[i]:.2f}dB"
+        )
+    return failures
+
+
+def check_indexed(output_dir: Path) -> list[str]:
+    prepare_indexed_image_dir(COLOR_TEST_SOURCE_DIR, output_dir)
+
+    source = load_source_images(COLOR_TEST_SOURCE_DIR, "RGB")
+    candidate = decode_indexed_image_dir(output_dir)
+    baseline = decode_indexed_image_dir(INDEXED_TEST_PROCESSED_DIR)
+
+    if candidate.shape != source.shape:
+        return [f"indexed: decoded {candidate.shape}, expected {source.shape}"]
+
+    candidate_psnr = psnr(candidate, source)
+    candidate_delta_e = delta_e(candidate, source)
+    report("indexed PSNR", candidate_psnr, "dB")
+    report("indexed ΔE", candidate_delta_e, "")
+
+    failures = []
+    for i in np.flatnonzero(candidate_psnr < MIN_INDEXED_PSNR):
+        failures.append(f"indexed frame {i}: PSNR {candidate_psnr[i]:.2f}dB")
+    for i in np.flatnonzero(candidate_delta_e > MAX_INDEXED_DELTA_E):
+        failures.append(f"indexed frame {i}: ΔE {candidate_delta_e[i]:.2f}")
+
+    if baseline.shape != source.shape:
+        report_stale("indexed", INDEXED_TEST_PROCESSED_DIR, baseline, source)
+        return failures
+
+    baseline_psnr = psnr(baseline, source)
+    baseline_delta_e = delta_e(baseline, source)
+    for i in np.flatnonzero(candidate_psnr < baseline_psnr - PSNR_TOLERANCE):
+        failures.append(
+            f"indexed frame {i}: PSNR regressed from "
+            f"{baseline_psnr[i]:.2f}dB to {candidate_psnr[i]:.2f}dB"
+        )
+    for i in np.flatnonzero(candidate_delta_e > baseline_delta_e + DELTA_E_TOLERANCE):
+        failures.append(
+            f"indexed frame {i}: ΔE regressed from "
+            f"{baseline_delta_e[i]:.2f} to {candidate_delta_e[i]:.2f}"
+        )
+    return failures
+
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    failures = check_grayscale(Path(tmp_dir) / "grayscale-image-data")
+    failures += check_indexed(Path(tmp_dir) / "indexed-image-data")
+
+if failures:
+    print(f"\n{len(failures)} quality check failures:")
+    for failure in failures:
+        print(f"  {failure}")
+    sys.exit(1)
+
+print("\nAll quality checks passed")
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from .packed import load_packed_images, unpack_channels
+
+
+def read_frame_count(input_dir: Path) -> int:
+    with open(Path(input_dir) / "data.txt", "r") as f:
+        return int(f.read())
+
+
+def decode_grayscale_image_dir(input_dir: Path) -> npt.NDArray[np.uint8]:
+    """Decode every frame the same way decodeGrayscaleImageFrag.glsl does.
+
+    Returns an array of shape (frame count, height, width). The shader copies
+    the selected channel into r, g, and b so one channel is all we need.
+    """
+    packed = load_packed_images(input_dir, "grayscale_*.png")
+    return unpack_channels(packed, read_frame_count(input_dir))
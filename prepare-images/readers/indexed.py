@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from .packed import load_packed_images, unpack_channels
+
+
+def load_color_luts(input_dir: Path) -> npt.NDArray[np.uint8]:
+    with open(Path(input_dir) / "color_lut.json", "r") as f:
+        luts = json.load(f)
+
+    # unused uniform array entries are zero on the GPU, so pad short palettes
+    # with black to match
+    lut_array = np.zeros((len(luts), 256, 3), dtype=np.uint8)
+    for i, lut in enumerate(luts):
+        for c, channel in enumerate("rgb"):
+            lut_array[i, : len(lut[channel]), c] = lut[channel]
+
+    return lut_array
+
+
+def _texel_coords(size: int) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    # vertTexCoord at the fragment centers when the image is drawn at its
+    # native size, scaled the same way the shader does it
+    coord = (np.arange(size, dtype=np.float32) + 0.5) / size * (size - 1)
+    floor_coord = np.floor(coord).astype(np.intp)
+    ceil_coord = np.ceil(coord).astype(np.intp)
+    weight = coord - np.floor(coord)
+    return floor_coord, ceil_coord, weight
+
+
+def decode_indexed_image_dir(
+    input_dir: Path, bilinear: bool = True
+) -> npt.NDArray[np.uint8]:
+    """Decode every frame the same way decodeIndexedImageFrag.glsl does.
+
+    Returns an array of shape (frame count, height, width, 3). The frame count
+    is the number of color lookup tables, same as the IndexedPlayer. Set
+    `bilinear` to False to skip the shader's texel interpolation and get the
+    exact palette colors.
+    """
+    luts = load_color_luts(input_dir)
+    packed = load_packed_images(input_dir, "indexed_*.png")
+    color_index = unpack_channels(packed, len(luts))
+
+    frames = np.arange(len(luts))[:, None, None]
+    colors = luts[frames, color_index]
+
+    if not bilinear:
+        return colors
+
+    _, h, w, _ = colors.shape
+    floor_x, ceil_x, weight_x = _texel_coords(w)
+    floor_y, ceil_y, weight_y = _texel_coords(h)
+
+    colors = colors.astype(np.float32) / 255
+    upper = colors[:, floor_y]
+    lower = colors[:, ceil_y]
+
+    weight_x = weight_x[None, None, :, None]
+    weight_y = weight_y[None, :, None, None]
+    color_upper = upper[:, :, floor_x] * (1 - weight_x) + upper[:, :, ceil_x] * weight_x
+    color_lower = lower[:, :, floor_x] * (1 - weight_x) + lower[:, :, ceil_x] * weight_x
+    color = color_upper * (1 - weight_y) + color_lower * weight_y
+
+    return np.round(color * 255).astype(np.uint8)
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+
+def load_packed_images(input_dir: Path, pattern: str) -> npt.NDArray[np.uint8]:
+    # sorted, same as the players do with the directory listing
+    img_files = sorted(Path(input_dir).glob(pattern))
+    if not img_files:
+        raise FileNotFoundError(f"no packed images matching {pattern} in {input_dir}")
+
+    return np.stack(
+        [np.asarray(Image.open(f).convert("RGBA"), dtype=np.uint8) for f in img_files]
+    )
+
+
+def unpack_channels(
+    packed: npt.NDArray[np.uint8], count: int
+) -> npt.NDArray[np.uint8]:
+    # (n, h, w, 4) -> (n * 4, h, w), frame i is in image i // 4, channel i % 4
+    n, h, w, _ = packed.shape
+    if count > n * 4:
+        raise ValueError(f"{count} frames cannot fit in {n} packed images")
+
+    return packed.transpose(0, 3, 1, 2).reshape(n * 4, h, w)[:count]
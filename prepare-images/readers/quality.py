@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+# sRGB (D65) to CIE XYZ
+RGB_TO_XYZ = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ],
+    dtype=np.float32,
+)
+D65_WHITE = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+
+def load_source_images(input_dir: Path, mode: str) -> npt.NDArray[np.uint8]:
+    # same file selection and ordering as the prepare_*_image_dir functions
+    img_files = sorted(Path(input_dir).glob("*.png"))
+    return np.stack(
+        [np.asarray(Image.open(f).convert(mode), dtype=np.uint8) for f in img_files]
+    )
+
+
+def psnr(
+    decoded: npt.NDArray[np.uint8], source: npt.NDArray[np.uint8]
+) -> npt.NDArray[np.float64]:
+    """Per frame PSNR in dB. Identical frames are infinite."""
+    diff = decoded.astype(np.float64) - source.astype(np.float64)
+    mse = np.mean(
+        (diff * diff).reshape(len(diff), -1),
+        axis=1,
+    )
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(255.0**2 / mse)
+
+
+def srgb_to_lab(rgb: npt.NDArray[np.uint8]) -> npt.NDArray[np.float32]:
+    c = rgb.astype(np.float32) / 255
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ RGB_TO_XYZ.T / D65_WHITE
+
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack(
+        [
+            116 * f[..., 1] - 16,
+            500 * (f[..., 0] - f[..., 1]),
+            200 * (f[..., 1] - f[..., 2]),
+        ],
+        axis=-1,
+    )
+
+
+def delta_e(
+    decoded: npt.NDArray[np.uint8], source: npt.NDArray[np.uint8]
+) -> npt.NDArray[np.float64]:
+    """Per frame mean CIE76 color difference. 2.3 is about a just noticeable
+    difference."""
+    diff = srgb_to_lab(decoded) - srgb_to_lab(source)
+    distance = np.sqrt(np.sum(diff * diff, axis=-1))
+    return distance.reshape(len(distance), -1).mean(axis=1, dtype=np.float64)